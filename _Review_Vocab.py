@@ -3,13 +3,20 @@
 ##==============================================================#
 
 from __future__ import annotations
-from collections import namedtuple
-from dataclasses import asdict, dataclass, field
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from functools import cached_property, lru_cache
 from math import isclose
-from threading import Thread, Lock
-from typing import Any, Generator, Optional
+from queue import Queue
+from threading import Event, Thread, Lock
+from typing import IO, Any, Generator, Iterable, Optional, get_args, get_origin, get_type_hints
 import abc
+import hashlib
 import itertools
+import os
 import os.path as op
 import random; random.seed()
 import re
@@ -18,17 +25,20 @@ import tempfile
 import time
 
 from auxly import trycatch
-from auxly.filesys import File, walkfiles
+from auxly.filesys import File
 from auxly.shell import has, silent
 from auxly.stringy import randomize
-from dacite import from_dict
 from gtts import gTTS as tts
 from playsound import playsound
-from thefuzz import fuzz
+from rapidfuzz import fuzz, process
 from unidecode import unidecode
 from wakepy import keep
 import qprompt as q
 import yaml
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 ##==============================================================#
 ## SECTION: Global Definitions                                  #
@@ -40,44 +50,87 @@ DEBUG_MODE = False
 #: Default talk cache option unless one is explicitly provided.
 CACHE_TALK = True
 
+#: Seconds gTTS may wait on the network so a stalled render cannot hang the app.
+TALK_TIMEOUT = 10
+
 ##==============================================================#
 ## SECTION: Class Definitions                                   #
 ##==============================================================#
 
-@dataclass(frozen=True)
-class LanguageName:
+class ConfigBase:
+    """Base for config dataclasses that are loaded from plain dicts."""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]):
+        kwargs = {}
+        for name, hint in ConfigBase._get_field_hints(cls):
+            if name in data:
+                kwargs[name] = ConfigBase._convert(name, hint, data[name])
+        return cls(**kwargs)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_field_hints(cls) -> tuple[tuple[str, Any], ...]:
+        hints = get_type_hints(cls)
+        return tuple((f.name, hints[f.name]) for f in fields(cls) if f.init)
+
+    @staticmethod
+    def _convert(name: str, hint: Any, value: Any) -> Any:
+        origin = get_origin(hint)
+        if isinstance(hint, type) and issubclass(hint, ConfigBase):
+            if isinstance(value, dict):
+                return hint.from_dict(value)
+        elif origin is list:
+            item_hint, = get_args(hint)
+            if isinstance(value, list) and all(isinstance(v, item_hint) for v in value):
+                return list(value)
+        elif origin is dict:
+            if isinstance(value, dict):
+                return value
+        elif hint is Any:
+            return value
+        elif hint is float:
+            if isinstance(value, (int, float)):
+                return value
+        elif isinstance(value, hint):
+            return value
+        raise Exception(f"Wrong value type for config field {name}: {value!r}")
+
+@dataclass(frozen=True, slots=True)
+class LanguageName(ConfigBase):
     short: str = "en"
     full: str = "English"
 
-@dataclass
-class CommonProviderConfig:
+@dataclass(slots=True)
+class CommonProviderConfig(ConfigBase):
     lang1: LanguageName = field(default_factory=LanguageName)
     lang2: LanguageName = field(default_factory=LanguageName)
 
-@dataclass
+@dataclass(slots=True)
 class SingleFileProviderConfig(CommonProviderConfig):
     filepath: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class MultiFileProviderConfig(CommonProviderConfig):
     filepaths: list[str] = field(default_factory=list[str])
 
 @dataclass
-class ProvidersConfig:
+class ProvidersConfig(ConfigBase):
     _default: str = "singlefile"
     _common: CommonProviderConfig = field(default_factory=CommonProviderConfig)
     singlefile: SingleFileProviderConfig = field(default_factory=SingleFileProviderConfig)
     multifile: MultiFileProviderConfig = field(default_factory=MultiFileProviderConfig)
 
-@dataclass
-class CommonModeConfig:
+@dataclass(slots=True)
+class CommonModeConfig(ConfigBase):
     reviewnum: int = 10
     shuffle: bool = False
 
     def show_editor(self):
         def set_field(f):
             v = getattr(self, f)
-            if type(v) == bool:
+            if isinstance(v, bool):
                 new_v = q.ask_yesno("Enter new value", default=v)
             else:
                 new_v = type(v)(q.ask_str("Enter new value", default=str(v)))
@@ -88,19 +141,24 @@ class CommonModeConfig:
             quit = True
         while not quit:
             menu = q.Menu(header=f"{self.__class__.__name__} Editor")
-            for i,f in enumerate(self.__dataclass_fields__, 1):
+            for i,f in enumerate(CommonModeConfig._get_field_names(type(self)), 1):
                 v = getattr(self, f)
                 menu.add(str(i), f"{f} [{v}]", set_field, [f])
             menu.add("q", "Quit editor", trigger_quit)
             menu.show(note=repr(self), default="q")
 
-@dataclass
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_field_names(cls) -> tuple[str, ...]:
+        return tuple(f.name for f in fields(cls))
+
+@dataclass(slots=True)
 class PracticeModeConfig(CommonModeConfig):
     to_lang1: bool = False
     min_score: int = 90
     missed_file: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class TranslateModeConfig(CommonModeConfig):
     listen_min_score: int = 90
     listen_attempts_before_reveal: int = 2
@@ -108,26 +166,26 @@ class TranslateModeConfig(CommonModeConfig):
     translate_min_score: int = 90
     skip_translate: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ListenModeConfig(CommonModeConfig):
     cmds: str = "talk1 slow2 fast2 beep"
     delay_between_cmds: float = 0.1
     output_file: str = ""
     repeat_file: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class LearnModeConfig(CommonModeConfig):
     lang1_talk: bool = True
     lang2_talk: bool = True
     max_attempts: int = 2
 
-@dataclass
+@dataclass(slots=True)
 class RapidModeConfig(CommonModeConfig):
     show_lang1_first: bool = True
     output_file: str = ""
 
 @dataclass
-class ModesConfig:
+class ModesConfig(ConfigBase):
     _default: str = "listen"
     _common: CommonModeConfig = field(default_factory=CommonModeConfig)
     listen: ListenModeConfig = field(default_factory=ListenModeConfig)
@@ -137,7 +195,7 @@ class ModesConfig:
     rapid: RapidModeConfig = field(default_factory=RapidModeConfig)
 
 @dataclass
-class UtilConfig:
+class UtilConfig(ConfigBase):
     modes: ModesConfig = field(default_factory=ModesConfig)
     providers: ProvidersConfig = field(default_factory=ProvidersConfig)
     _cfgdict: dict[str, Any] = field(default_factory=dict)
@@ -147,8 +205,9 @@ class UtilConfig:
         cfile = File(path)
         if not cfile.isfile():
             raise Exception(f"Provided config file could not be found: {path}")
-        cfgdict = yaml.load(cfile.read(), Loader=yaml.FullLoader)
-        config = from_dict(data_class=UtilConfig, data=cfgdict)
+        with open(path, encoding="utf-8") as fi:
+            cfgdict = yaml.load(fi, Loader=YamlLoader)
+        config = UtilConfig.from_dict(cfgdict)
         config._cfgdict = cfgdict
         return config
 
@@ -157,11 +216,20 @@ class UtilConfig:
             mode = getattr(self.modes, modename)
         except AttributeError:
             return None
-        cfgdict = asdict(self.modes._common)
+        cfgdict = dict(self._common_mode_dict)
         cfgdict.update(self._cfgdict.get('modes', {}).get(modename, {}))
         if overrides:
             cfgdict.update(overrides)
-        return from_dict(data_class=type(mode), data=cfgdict)
+        return type(mode).from_dict(cfgdict)
+
+    @cached_property
+    def _common_mode_dict(self) -> dict[str, Any]:
+        """The common mode config is only set on load so it is converted once."""
+        return asdict(self.modes._common)
+
+    @cached_property
+    def _common_provider_dict(self) -> dict[str, Any]:
+        return asdict(self.providers._common)
 
     def get_default_mode(self) -> str:
         return self.modes._default
@@ -177,56 +245,78 @@ class UtilConfig:
             provider = getattr(self.providers, providername)
         except AttributeError:
             return None
-        cfgdict = asdict(self.providers._common)
+        cfgdict = dict(self._common_provider_dict)
         cfgdict.update(self._cfgdict.get('providers', {}).get(providername, {}))
         if overrides:
             cfgdict.update(overrides)
-        return from_dict(data_class=type(provider), data=cfgdict)
+        return type(provider).from_dict(cfgdict)
 
-@dataclass(frozen=True)
+ParsedLine = namedtuple('ParsedLine', [
+    'lang1_equivs', 'lang1_extra', 'lang1_sanitized',
+    'lang2_equivs', 'lang2_extra', 'lang2_sanitized',
+])
+
+@dataclass(frozen=True, slots=True)
 class ReviewItem:
     line: str
     lang1: LanguageName
     lang1_choice: str
-    lang1_equivs: list[str]
+    lang1_equivs: tuple[str, ...]
     lang1_extra: str
+    lang1_sanitized: tuple[str, ...]
     lang2: LanguageName
     lang2_choice: str
-    lang2_equivs: list[str]
+    lang2_equivs: tuple[str, ...]
     lang2_extra: str
+    lang2_sanitized: tuple[str, ...]
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_hash", hash((self.line, self.lang1, self.lang2)))
+
     def __hash__(self):
-        return hash(self.line) + hash(self.lang1) + hash(self.lang2)
+        return self._hash
 
     @staticmethod
     def parse(line: str, lang1: LanguageName, lang2: LanguageName):
-        lang1_equivs = ReviewItem._get_equivs(line, 1)
-        lang2_equivs = ReviewItem._get_equivs(line, 2)
+        parsed = ReviewItem._parse_line(line)
         return ReviewItem(
             line,
             lang1,
-            random.choice(lang1_equivs),
-            lang1_equivs,
-            ReviewItem._get_extra(line, 1),
+            random.choice(parsed.lang1_equivs),
+            parsed.lang1_equivs,
+            parsed.lang1_extra,
+            parsed.lang1_sanitized,
             lang2,
-            random.choice(lang2_equivs),
-            lang2_equivs,
-            ReviewItem._get_extra(line, 2),
+            random.choice(parsed.lang2_equivs),
+            parsed.lang2_equivs,
+            parsed.lang2_extra,
+            parsed.lang2_sanitized,
         )
 
     @staticmethod
-    def _get_lang_index(langnum: int) -> int:
-        idx = langnum - 1
-        return idx if (idx == 0 or idx == 1) else 0
+    @lru_cache(maxsize=4096)
+    def _parse_line(line: str) -> ParsedLine:
+        """Parses the parts of a line that do not change between reviews."""
+        text1, text2 = line.split(";", 1)
+        lang1_equivs = tuple(LangParser.get_equivs(text1))
+        lang2_equivs = tuple(LangParser.get_equivs(text2))
+        return ParsedLine(
+            lang1_equivs,
+            LangParser.get_extra(text1),
+            ResponseChecker.sanitize_answers(lang1_equivs),
+            lang2_equivs,
+            LangParser.get_extra(text2),
+            ResponseChecker.sanitize_answers(lang2_equivs),
+        )
 
-    @staticmethod
-    def _get_equivs(line, langnum) -> list[str]:
-        idx = ReviewItem._get_lang_index(langnum)
-        return LangParser.get_equivs(line.split(";")[idx])
+    def sanitized_answers_for(self, langnum: int) -> tuple[str, ...]:
+        return self.lang2_sanitized if langnum == 2 else self.lang1_sanitized
 
-    @staticmethod
-    def _get_extra(line, langnum):
-        idx = ReviewItem._get_lang_index(langnum)
-        return LangParser.get_extra(line.split(";")[idx])
+    def sanitized_choice_for(self, langnum: int) -> str:
+        if langnum == 2:
+            return self.lang2_sanitized[self.lang2_equivs.index(self.lang2_choice)]
+        return self.lang1_sanitized[self.lang1_equivs.index(self.lang1_choice)]
 
 class Static:
     def __new__(cls):
@@ -243,14 +333,27 @@ class ProviderBase(metaclass=abc.ABCMeta):
     def show_menu(self):
         q.echo("Menu not implemented")
 
+    @staticmethod
+    def _select_lines(lines: Sequence[str], reviewnum: int, shuffle: bool) -> list[str]:
+        if not shuffle:
+            return lines[:reviewnum]
+        if reviewnum >= len(lines):
+            selected = list(lines)
+            random.shuffle(selected)
+            return selected
+        return random.sample(lines, reviewnum)
+
 class SingleFileProvider(ProviderBase):
+    def __init__(self, config):
+        super().__init__(config)
+        self._files_cache: Optional[tuple[tuple, list[str]]] = None
+
     def get_items(self, reviewnum: int, shuffle: bool) -> list[ReviewItem]:
         pfile = File(self.config.filepath)
         if not pfile.exists():
             raise Exception(f"File could not be found: {self.config.filepath}")
-        lines = FileParser.get_valid_lines(pfile.read())
-        samplenum = reviewnum if (reviewnum <= len(lines)) else len(lines)
-        review_lines = random.sample(lines, samplenum) if shuffle else lines[:reviewnum]
+        lines = FileParser.read_valid_lines(pfile)
+        review_lines = ProviderBase._select_lines(lines, reviewnum, shuffle)
         return [ReviewItem.parse(l, self.config.lang1, self.config.lang2) for l in review_lines]
 
     def show_menu(self):
@@ -268,62 +371,107 @@ class SingleFileProvider(ProviderBase):
 
     def _show_all_files(self):
         dirpath = File(self.config.filepath).parent
-        files = [f for f in self._iterfiles()]
+        files = self._list_files()
         path = q.enum_menu(files).show(header="Select File", returns="desc", limit=20)
         self.config.filepath = File(op.join(dirpath, path))
 
     def _show_filtered_files(self):
         term = q.ask_str("Filter term")
         dirpath = File(self.config.filepath).parent
-        files = [f for f in self._iterfiles() if (term in f)]
+        files = [f for f in self._list_files() if (term in f)]
         path = q.enum_menu(files).show(header="Select File", returns="desc", limit=20)
         self.config.filepath = File(op.join(dirpath, path))
 
-    def _iterfiles(self):
+    def _list_files(self) -> list[str]:
+        """Returns names of the files next to the selected file with the same extension."""
         currfile = File(self.config.filepath)
-        for f in walkfiles(currfile.parent):
-            if f.endswith(currfile.ext):
-                yield f.name
+        dirpath = currfile.parent
+        if not op.isdir(dirpath):
+            return []
+        key = (str(dirpath), currfile.ext, op.getmtime(dirpath))
+        if not self._files_cache or self._files_cache[0] != key:
+            with os.scandir(dirpath) as entries:
+                names = [e.name for e in entries if e.name.endswith(currfile.ext) and e.is_file()]
+            self._files_cache = (key, names)
+        return self._files_cache[1]
+
+class ChainedLines(Sequence):
+    """Read-only view over several line lists that avoids concatenating them."""
+    def __init__(self, parts: list[list[str]]):
+        self._parts = parts
+        self._ends = list(itertools.accumulate(len(p) for p in parts))
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._parts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(itertools.islice(self, start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ChainedLines index out of range")
+        partnum = bisect_right(self._ends, index)
+        start = self._ends[partnum - 1] if partnum else 0
+        return self._parts[partnum][index - start]
 
 class MultiFileProvider(ProviderBase):
     def get_items(self, reviewnum: int, shuffle: bool) -> list[ReviewItem]:
-        lines = []
         if len(self.config.filepaths) == 0:
             raise Exception("No founds found")
         for filepath in self.config.filepaths:
-            pfile = File(filepath)
-            if not pfile.exists():
+            if not File(filepath).exists():
                 raise Exception(f"File could not be found: {filepath}")
-            lines += FileParser.get_valid_lines(pfile.read())
-        samplenum = reviewnum if (reviewnum <= len(lines)) else len(lines)
-        review_lines = random.sample(lines, samplenum) if shuffle else lines[:reviewnum]
+        lines = ChainedLines([FileParser.read_valid_lines(fp) for fp in self.config.filepaths])
+        review_lines = ProviderBase._select_lines(lines, reviewnum, shuffle)
         return [ReviewItem.parse(l, self.config.lang1, self.config.lang2) for l in review_lines]
 
 class FileParser(Static):
+    _LINES_CACHE: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+    _LINES_CACHE_SIZE = 64
+    #: Matches lines with exactly one `;` that are not `//` or `#` comments.
+    _VALID_LINE_RE = re.compile(r"(?!//|#)[^;]*;[^;]*")
+
     @staticmethod
-    def get_valid_lines(content):
-        lines = []
-        for line in content.splitlines():
-            if FileParser._is_line_valid(line):
-                lines.append(line.strip())
+    def read_valid_lines(path) -> list[str]:
+        """Returns the valid lines of the given file, cached until the file is modified."""
+        path = op.abspath(path)
+        mtime = op.getmtime(path)
+        cached = FileParser._LINES_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            FileParser._LINES_CACHE.move_to_end(path)
+            return cached[1]
+        with open(path, encoding="utf-8") as fi:
+            lines = FileParser.get_valid_lines(fi.read())
+        FileParser._LINES_CACHE[path] = (mtime, lines)
+        FileParser._LINES_CACHE.move_to_end(path)
+        if len(FileParser._LINES_CACHE) > FileParser._LINES_CACHE_SIZE:
+            FileParser._LINES_CACHE.popitem(last=False)
         return lines
 
     @staticmethod
-    def _is_line_valid(line):
-        if not line:
-            return False
-        if line.count(";") != 1:
-            return False
-        if line.startswith("//"):
-            return False
-        if line.startswith("#"):
-            return False
-        return True
+    def get_valid_lines(content):
+        return FileParser.filter_valid_lines(content.splitlines())
+
+    @staticmethod
+    def filter_valid_lines(lines: Iterable[str]) -> list[str]:
+        """Returns the stripped valid lines from any iterable of lines."""
+        is_valid = FileParser._VALID_LINE_RE.fullmatch
+        return [line.strip() for line in lines if is_valid(line)]
 
 class LangParser(Static):
+    _EXTRA_RE = re.compile(r"\(.*?\)")
+    _PARENTHESES_RE = re.compile(r"\([^)]*\)")
+
     @staticmethod
     def get_extra(text: str) -> str:
-        extra = re.findall(r"\(.*?\)", text)
+        extra = LangParser._EXTRA_RE.findall(text)
         return " ".join(extra)
 
     @staticmethod
@@ -331,31 +479,30 @@ class LangParser(Static):
         result = []
         newtext = LangParser._remove_parentheses(text)
         for equiv in LangParser._split_equivalents(newtext):
-            result += LangParser._separate_equiv_words(equiv)
-        return result
+            result.extend(LangParser._separate_equiv_words(equiv))
+        return list(dict.fromkeys(result))
 
     @staticmethod
     def _remove_parentheses(text: str) -> str:
-        return re.sub(r"\([^)]*\)", "", text).strip()
+        return LangParser._PARENTHESES_RE.sub("", text).strip()
 
     @staticmethod
     def _split_equivalents(text: str) -> list[str]:
         return text.split("/")
 
     @staticmethod
-    def _separate_equiv_words(text: str) -> list[str]:
+    def _separate_equiv_words(text: str) -> Generator[str, None, None]:
         if "|" not in text:
-            return [text]
+            yield text
+            return
         tokens = []
         for token in text.strip().split():
             if "|" in token:
                 tokens.append(LangParser._split_equiv_tokens(token))
             else:
                 tokens.append([token])
-        results = []
         for combo in itertools.product(*tokens):
-            results.append(" ".join(combo))
-        return results
+            yield " ".join(combo)
 
     @staticmethod
     def _split_equiv_tokens(token: str) -> list[str]:
@@ -366,11 +513,8 @@ class LangParser(Static):
                 punct_to_add.insert(0, char)
         if not punct_to_add:
             return equivs
-        equivs_with_punct = []
-        for equiv in equivs[:-1]:
-            for char in punct_to_add:
-                equiv += char
-            equivs_with_punct.append(equiv)
+        suffix = "".join(punct_to_add)
+        equivs_with_punct = [equiv + suffix for equiv in equivs[:-1]]
         equivs_with_punct.append(equivs[-1])
         return equivs_with_punct
 
@@ -380,6 +524,7 @@ class ModeBase(metaclass=abc.ABCMeta):
         self._provider = provider
         self._review: list[ReviewItem] = []
         self._curr_num = 0
+        self._appenders: dict[str, IO] = {}
 
     @property
     def config(self):
@@ -405,11 +550,15 @@ class ModeBase(metaclass=abc.ABCMeta):
 
     def review(self):
         with keep.presenting():
-            self._review_start()
-            for num, item in enumerate(self._iter_review(), 1):
-                self._curr_num = num
-                self.reset_banner()
-                self._review_item(item)
+            try:
+                self._review_start()
+                for num, item in enumerate(self._review, 1):
+                    self._curr_num = num
+                    self.reset_banner()
+                    self._review_item(item)
+            finally:
+                self._close_appenders()
+                Audio.cancel_prefetch()
             self._review_end()
             q.clear()
 
@@ -424,14 +573,28 @@ class ModeBase(metaclass=abc.ABCMeta):
 
     def _review_start(self):
         self._review = self._provider.get_items(self.config.reviewnum, self.config.shuffle)
+        Audio.prefetch(t for item in self._review for t in self._get_talks(item))
 
-    def _iter_review(self) -> Generator[ReviewItem, None, None]:
-        for item in self._review:
-            yield item
+    def _get_talks(self, item) -> list[TalkRequest]:
+        """Returns the talks the mode will use for the given item so they can be prefetched."""
+        return []
 
     def _review_end(self):
         pass
 
+    def _append_line(self, path: str, line: str):
+        """Appends the line to the given file, the file is kept open until the review ends."""
+        appender = self._appenders.get(path)
+        if appender is None:
+            File(path).make()
+            appender = self._appenders[path] = open(path, "a", encoding="utf-8")
+        appender.write(line + "\n")
+
+    def _close_appenders(self):
+        for appender in self._appenders.values():
+            appender.close()
+        self._appenders = {}
+
     @abc.abstractmethod
     def _review_item(self, item):
         pass
@@ -443,9 +606,11 @@ class PracticeMode(ModeBase):
         self._repeat = None
 
     def _review_start(self):
-        self._missed = set()
+        # Missed items are kept in a dict so repeats follow the review order.
+        self._missed: dict[ReviewItem, None] = {}
         if self._repeat != None:
             self._review = self._repeat
+            self._repeat = None
         else:
             super()._review_start()
 
@@ -456,28 +621,30 @@ class PracticeMode(ModeBase):
         if len(self._missed) == 0:
             q.pause()
         elif q.ask_yesno("Repeat missed items?"):
-            self._repeat = self._missed
+            self._repeat = list(self._missed)
             self.review()
 
-    def _get_question_extra_answers(self, item) -> tuple[str, str, list[str]]:
+    def _get_question_extra_answers(self, item) -> tuple[str, str, tuple[str, ...], tuple[str, ...]]:
         if not self.config.to_lang1:
-            question = random.choice(item.lang1_equivs)
+            question = item.lang1_choice
             extra = item.lang1_extra
             answers = item.lang2_equivs
-            return question, extra, answers
+            sanitized_answers = item.sanitized_answers_for(2)
+            return question, extra, answers, sanitized_answers
         else:
-            question = random.choice(item.lang2_equivs)
+            question = item.lang2_choice
             extra = item.lang2_extra
             answers = item.lang1_equivs
-            return question, extra, answers
+            sanitized_answers = item.sanitized_answers_for(1)
+            return question, extra, answers, sanitized_answers
 
     def _review_item(self, item):
-        question, extra, answers = self._get_question_extra_answers(item)
+        question, extra, answers, sanitized_answers = self._get_question_extra_answers(item)
         q.alert(f"{question} {extra}")
         correct = False
         while not correct:
             response = q.ask_str("")
-            score = ResponseChecker.get_score(response, answers)
+            score = ResponseChecker.get_score(response, sanitized_answers, sanitized=True, score_cutoff=self.config.min_score)
             correct = score >= self.config.min_score
             if correct:
                 q.echo("Correct!" if score == 100 else "Almost correct!")
@@ -489,12 +656,16 @@ class PracticeMode(ModeBase):
             else:
                 q.echo("Incorrect!")
                 q.echo(" (OR) ".join(answers))
-                self._missed.add(item)
+                self._missed[item] = None
                 if self.config.missed_file:
-                    File(self.config.missed_file).appendline(item.line)
+                    self._append_line(self.config.missed_file, item.line)
 
 class TranslateMode(ModeBase):
     """The user must listen to a lang2 translation, enter it correctly, then enter the lang1 translation."""
+    def _get_talks(self, item) -> list[TalkRequest]:
+        # The slow talk only plays after a wrong attempt so it is generated when needed.
+        return [TalkRequest(item.lang2_choice, item.lang2.short, False, 1)]
+
     def _review_item(self, item):
         self._do_listen(item)
         if not self.config.skip_translate:
@@ -506,13 +677,14 @@ class TranslateMode(ModeBase):
     def _do_listen(self, item):
         Audio.talk(item.lang2_choice, item.lang2.short, slow=False, wait=False)
         q.echo(f"(Type the {item.lang2.full} you hear.)")
+        answers = [item.sanitized_choice_for(2)]
         attempts = 0
         correct = False
         score = 0
         while score != 100:
             response = q.ask_str("")
             if response:
-                score = ResponseChecker.get_score(response, [item.lang2_choice])
+                score = ResponseChecker.get_score(response, answers, sanitized=True, score_cutoff=self.config.listen_min_score)
                 correct = score >= self.config.listen_min_score
                 if not correct:
                     attempts += 1
@@ -527,25 +699,36 @@ class TranslateMode(ModeBase):
     def _do_translate(self, item):
         q.echo(f"(Type the {item.lang1.full} translation.)")
         Audio.talk(item.lang2_choice, item.lang2.short, slow=False, wait=False)
+        answers = item.sanitized_answers_for(1)
         attempts = 0
         correct = False
         while not correct:
             response = q.ask_str("")
-            score = ResponseChecker.get_score(response, item.lang1_equivs)
+            score = ResponseChecker.get_score(response, answers, sanitized=True, score_cutoff=self.config.translate_min_score)
             correct = score >= self.config.translate_min_score
             if not correct:
                 attempts += 1
                 if attempts >= self.config.translate_attempts_before_reveal:
-                    q.alert(random.choice(item.lang1_equivs))
+                    q.alert(item.lang1_choice)
         q.echo("Correct!" if score == 100 else "Almost correct!")
         q.echo(" (OR) ".join(item.lang1_equivs))
         Audio.talk(item.lang2_choice, item.lang2.short, slow=False, wait=True)
 
 class ListenMode(ModeBase):
     """Audio flashcards for review or testing."""
+    def _get_talks(self, item) -> list[TalkRequest]:
+        talks = []
+        for cmd in self.config.cmds.split():
+            if cmd.startswith("talk1"):
+                talks.append(TalkRequest(item.lang1_choice, item.lang1.short, False, ListenMode._get_speed(cmd)))
+            elif cmd.startswith("fast2") or cmd.startswith("slow2"):
+                slow = cmd.startswith("slow")
+                talks.append(TalkRequest(item.lang2_choice, item.lang2.short, slow, ListenMode._get_speed(cmd)))
+        return talks
+
     def _review_item(self, item):
         if self.config.output_file:
-            File(self.config.output_file).appendline(item.line)
+            self._append_line(self.config.output_file, item.line)
         cmds = self.config.cmds.split()
         while cmds:
             cmds = self._run_cmds(cmds, item)
@@ -586,7 +769,7 @@ class ListenMode(ModeBase):
                 if q.ask_yesno("Repeat?", default=False):
                     self.reset_banner()
                     if self.config.repeat_file:
-                        File(self.config.repeat_file).appendline(item.line)
+                        self._append_line(self.config.repeat_file, item.line)
                     return cmds
             elif cmd == "beep":
                 Audio.beep()
@@ -594,12 +777,12 @@ class ListenMode(ModeBase):
         return []
 
     def _do_lang1(self, item):
-        translation = random.choice(item.lang1_equivs)
+        translation = item.lang1_choice
         q.alert(translation)
         Audio.talk(translation, item.lang1.short, wait=True)
 
     def _do_lang2(self, item):
-            translation = random.choice(item.lang2_equivs)
+            translation = item.lang2_choice
             q.alert(translation)
             for _ in range(self.config.lang2_repeat_slow):
                 Audio.talk(translation, item.lang2.short, slow=True, wait=True)
@@ -608,6 +791,16 @@ class ListenMode(ModeBase):
 
 class LearnMode(ModeBase):
     """The user must type in the displayed lang2 translation, then type it in again from memory."""
+    def _get_talks(self, item) -> list[TalkRequest]:
+        talks = [
+            TalkRequest(item.lang2_choice, item.lang2.short, True, 0.9),
+            TalkRequest(item.lang1_choice, item.lang1.short, False, 1),
+            TalkRequest(item.lang2_choice, item.lang2.short, True, 1),
+        ]
+        if self.config.lang2_talk:
+            talks.append(TalkRequest(item.lang2_choice, item.lang2.short, False, 1))
+        return talks
+
     def _review_item(self, item):
         correct = False
         while not correct:
@@ -623,10 +816,11 @@ class LearnMode(ModeBase):
         if self.config.lang2_talk:
             Audio.talk(item.lang2_choice, item.lang2.short, slow=False)
             Audio.talk(item.lang2_choice, item.lang2.short, slow=True)
+        answers = [item.sanitized_choice_for(2)]
         correct = False
         while not correct:
             response = q.ask_str("")
-            correct = ResponseChecker.is_valid(response, [item.lang2_choice])
+            correct = ResponseChecker.is_valid(response, answers, sanitized=True)
         q.echo("Correct!")
         time.sleep(1)
         Audio.wait_talk()
@@ -634,12 +828,13 @@ class LearnMode(ModeBase):
     def _test(self, item) -> bool:
         q.clear()
         q.echo(f"(Type the {item.lang2.full} translation.)")
+        answers = [item.sanitized_choice_for(2)]
         correct = False
         attempts = 0
         while not correct:
             Audio.talk(item.lang2_choice, item.lang2.short, slow=True, speed=0.9)
             response = q.ask_str("")
-            correct = ResponseChecker.is_valid(response, [item.lang2_choice])
+            correct = ResponseChecker.is_valid(response, answers, sanitized=True)
             if not correct:
                 attempts += 1
                 if attempts >= self.config.max_attempts:
@@ -663,32 +858,57 @@ class RapidMode(ModeBase):
         q.echo(">>> " + second)
         if self.config.output_file:
             if q.ask_yesno("Add to output file?", default=False):
-                File(self.config.output_file).appendline(item.line)
+                self._append_line(self.config.output_file, item.line)
         else:
             q.pause()
 
 class ResponseChecker(Static):
+    #: Deletes everything but spaces, lowercase letters and digits; unidecode output is always ASCII.
+    _SANITIZE_TABLE = str.maketrans("", "", "".join(c for c in map(chr, range(128)) if c not in " abcdefghijklmnopqrstuvwxyz0123456789"))
+
     @staticmethod
-    def is_valid(response: str, valid_answers: list[str], min_valid_score=100) -> bool:
-        score = ResponseChecker.get_score(response, valid_answers)
+    def is_valid(response: str, valid_answers: Sequence[str], min_valid_score=100, sanitized=False) -> bool:
+        score = ResponseChecker.get_score(response, valid_answers, sanitized=sanitized, score_cutoff=min_valid_score)
         return score >= min_valid_score
 
     @staticmethod
-    def get_score(response: str, valid_answers: list[str]) -> int:
-        """Returns correctness as a score, 100 is exactly correct."""
+    def get_score(response: str, valid_answers: Sequence[str], sanitized=False, score_cutoff=0) -> int:
+        """Returns correctness as a score, 100 is exactly correct. Scores below the cutoff return 0."""
         sanitized_response = ResponseChecker._sanitize(response)
-        sanitized_answers = [ResponseChecker._sanitize(a) for a in valid_answers]
-        ratios = [fuzz.ratio(sanitized_response, a) for a in sanitized_answers]
-        return max(ratios)
+        sanitized_answers = valid_answers if sanitized else ResponseChecker.sanitize_answers(valid_answers)
+        if sanitized_response in sanitized_answers:
+            return 100
+        # Scores are rounded so allow raw scores that would round up to the cutoff.
+        cutoff = max(score_cutoff - 0.5, 0)
+        best = process.extractOne(sanitized_response, sanitized_answers, scorer=fuzz.ratio, score_cutoff=cutoff)
+        if best is None:
+            return 0
+        score = int(round(best[1]))
+        return score if score >= score_cutoff else 0
+
+    @staticmethod
+    def sanitize_answers(answers: Sequence[str]) -> tuple[str, ...]:
+        return tuple(ResponseChecker._sanitize(a) for a in answers)
 
     @staticmethod
     def _sanitize(txt: str) -> str:
-        sanitized = unidecode(txt.lower().strip())
-        sanitized = re.sub(r'[^ a-z0-9]', '', sanitized, re.UNICODE)
-        return sanitized
+        lowered = txt.lower().strip()
+        if not lowered.isascii():
+            lowered = unidecode(lowered)
+        return lowered.translate(ResponseChecker._SANITIZE_TABLE)
+
+TalkRequest = namedtuple('TalkRequest', ['text', 'lang', 'slow', 'speed'])
 
 class Audio(Static):
-    _TALK_LOCK = Lock()
+    #: Talk files waiting to be played by the talk worker, played one at a time.
+    _TALK_QUEUE: Queue = Queue()
+    _TALK_WORKER: Optional[Thread] = None
+    _TALK_WORKER_LOCK = Lock()
+    _PREFETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+    _PREFETCHING: dict[str, Future] = {}
+    _PREFETCHING_LOCK = Lock()
+    #: Deletes double quotes from talk text in one pass.
+    _TALK_QUOTES_TABLE = str.maketrans("", "", '"“”')
 
     @staticmethod
     def beep():
@@ -700,16 +920,33 @@ class Audio(Static):
 
     @staticmethod
     def wait_talk():
-        while Audio._TALK_LOCK.locked():
-            time.sleep(0.1)
+        Audio._TALK_QUEUE.join()
+
+    @staticmethod
+    def _start_talk_worker():
+        with Audio._TALK_WORKER_LOCK:
+            if not Audio._TALK_WORKER:
+                Audio._TALK_WORKER = Thread(target=Audio._talk_loop, name="talk", daemon=True)
+                Audio._TALK_WORKER.start()
+
+    @staticmethod
+    def _talk_loop():
+        """Pronounces the queued talk files in order."""
+        while True:
+            talkfile, cache, done = Audio._TALK_QUEUE.get()
+            try:
+                playsound(talkfile, block=True)
+                if not cache:
+                    talkfile.delete()
+            except Exception:
+                q.warn("Could not talk at this time.")
+            finally:
+                done.set()
+                Audio._TALK_QUEUE.task_done()
 
     @staticmethod
     def _sanitize_for_talk(text: str) -> str:
-        chars_to_strip = ["'’‘"]
-        sanitized_text = text.replace('"', '').replace('“', '').replace('”', '')
-        for char in chars_to_strip:
-            sanitized_text = sanitized_text.strip(char)
-        return sanitized_text
+        return text.translate(Audio._TALK_QUOTES_TABLE).strip("'’‘")
 
     @staticmethod
     def _adjust_speed(talkfile, speed):
@@ -723,33 +960,83 @@ class Audio(Static):
             q.warn(f"Could not adjust speed of file: {talkfile}")
         temptalk.delete()
 
+    @staticmethod
+    def prefetch(talks):
+        """Generates the talk files for the given talk requests in the background."""
+        if not CACHE_TALK:
+            return
+        with Audio._PREFETCHING_LOCK:
+            # Submitted in review order so the first talks are generated first.
+            for talk in dict.fromkeys(talks):
+                path = str(Audio._get_talkfile(talk.text, talk.lang, talk.slow, talk.speed))
+                if path not in Audio._PREFETCHING and not op.exists(path):
+                    Audio._PREFETCHING[path] = Audio._PREFETCH_POOL.submit(Audio._prefetch_talkfile, path, *talk)
+
+    @staticmethod
+    def cancel_prefetch():
+        """Cancels the talk prefetches that have not started yet."""
+        with Audio._PREFETCHING_LOCK:
+            for path, pending in list(Audio._PREFETCHING.items()):
+                if pending.cancel():
+                    del Audio._PREFETCHING[path]
+
+    @staticmethod
+    def shutdown():
+        """Stops prefetching without waiting on queued talk files; call before exiting."""
+        Audio._PREFETCH_POOL.shutdown(wait=False, cancel_futures=True)
+        with Audio._PREFETCHING_LOCK:
+            Audio._PREFETCHING.clear()
+
+    @staticmethod
+    def _prefetch_talkfile(path, text, lang, slow, speed):
+        talkfile = File(path)
+        try:
+            Audio._make_talkfile(talkfile, Audio._sanitize_for_talk(text), lang, slow, speed)
+        except Exception:
+            talkfile.delete()
+            raise
+        finally:
+            with Audio._PREFETCHING_LOCK:
+                Audio._PREFETCHING.pop(path, None)
+
+    @staticmethod
+    def _get_talkfile(text, lang, slow, speed) -> File:
+        sanitized_text = Audio._sanitize_for_talk(text)
+        talkkey = f"{lang}-{slow}-{speed}-{sanitized_text}".encode("utf-8")
+        sanitized_hash = hashlib.blake2b(talkkey, digest_size=12).hexdigest()
+        return File(tempfile.gettempdir(), "ReviewVocab", "talk", lang, f"__temp-talk-{sanitized_hash}.mp3",)
+
+    @staticmethod
+    def _make_talkfile(talkfile, sanitized_text, lang, slow, speed):
+        talkfile.make()
+        tts(text=sanitized_text, lang=lang, slow=slow, timeout=TALK_TIMEOUT).save(talkfile)
+        if not isclose(speed, 1):
+            Audio._adjust_speed(talkfile, speed)
+
     @staticmethod
     def talk(text, lang, slow=False, wait=False, speed=1, cache: Optional[bool] = None):
         if cache is None:
             cache = CACHE_TALK
-        def _talk(talkfile):
-            """Pronounces the given text in the given language."""
-            with Audio._TALK_LOCK:
-                playsound(talkfile, block=True)
-                if not cache:
-                    talkfile.delete()
         sanitized_text = Audio._sanitize_for_talk(text)
-        sanitized_hash = str(hash(f"{lang}-{slow}-{speed}-{sanitized_text}")).replace("-", "d")
-        talkfile = File(tempfile.gettempdir(), "ReviewVocab", "talk", lang, f"__temp-talk-{sanitized_hash}.mp3",)
+        talkfile = Audio._get_talkfile(text, lang, slow, speed)
+        with Audio._PREFETCHING_LOCK:
+            pending = Audio._PREFETCHING.get(str(talkfile))
+            # A prefetch that has not started yet is generated here instead of waiting for the pool.
+            if pending and pending.cancel():
+                Audio._PREFETCHING.pop(str(talkfile), None)
+                pending = None
+        if pending:
+            try:
+                pending.result()
+            except Exception:
+                pass
         if not talkfile.exists():
-            talkfile.make()
-            tts(text=sanitized_text, lang=lang, slow=slow).save(talkfile)
-            if not isclose(speed, 1):
-                Audio._adjust_speed(talkfile, speed)
-        try:
-            t = Thread(target=_talk, args=(talkfile,))
-            t.start()
-            if wait:
-                t.join()
-        except KeyboardInterrupt:
-            raise
-        except Exception:
-            q.warn("Could not talk at this time.")
+            Audio._make_talkfile(talkfile, sanitized_text, lang, slow, speed)
+        Audio._start_talk_worker()
+        done = Event()
+        Audio._TALK_QUEUE.put((talkfile, cache, done))
+        if wait:
+            done.wait()
 
 class MainMenu(Static):
     @staticmethod
@@ -811,6 +1098,9 @@ def main():
         MainMenu.show(cfgpath)
     except KeyboardInterrupt:
         pass
+    finally:
+        # The prefetch pool is joined at interpreter exit before atexit hooks run, so stop it here.
+        Audio.shutdown()
 
 ##==============================================================#
 ## SECTION: Main Body                                           #
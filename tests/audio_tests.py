@@ -0,0 +1,102 @@
+"""Tests Audio class."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import mock
+import tempfile
+
+import _Review_Vocab
+from _Review_Vocab import Audio, TalkRequest
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class FakeTTS:
+    """Stands in for gTTS, records the rendered text and blocks rendering "x" until released."""
+    def __init__(self, rendered, block):
+        self._rendered = rendered
+        self._block = block
+        self.started = Event()
+
+    def __call__(self, text, lang, slow, timeout=None):
+        self.timeout = timeout
+        return FakeRender(self, text)
+
+class FakeRender:
+    def __init__(self, fake, text):
+        self._fake = fake
+        self._text = text
+
+    def save(self, path):
+        if self._text == "x":
+            self._fake.started.set()
+            self._fake._block.wait(5)
+        self._fake._rendered.append(self._text)
+        with open(str(path), "wb") as fo:
+            fo.write(b"mp3")
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rendered = []
+        self.played = []
+        self.block = Event()
+        self.tts = FakeTTS(self.rendered, self.block)
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        patches = [
+            mock.patch("tempfile.gettempdir", return_value=self.tmpdir.name),
+            mock.patch.object(_Review_Vocab, "tts", self.tts),
+            mock.patch.object(_Review_Vocab, "playsound", lambda path, block: self.played.append(str(path))),
+            mock.patch.object(Audio, "_PREFETCH_POOL", self.pool),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.block.set()
+        self.pool.shutdown(wait=True)
+        self.tmpdir.cleanup()
+
+    def test_that_prefetch_renders_in_review_order(self):
+        self.block.set()
+        Audio.prefetch(TalkRequest(t, "it", False, 1) for t in ["c", "a", "b", "a"])
+        self.pool.shutdown(wait=True)
+        self.assertEqual(self.rendered, ["c", "a", "b"])
+        self.assertEqual(self.tts.timeout, _Review_Vocab.TALK_TIMEOUT)
+        self.assertEqual(Audio._PREFETCHING, {})
+
+    def test_that_talk_renders_unstarted_prefetch_inline(self):
+        Audio.prefetch(TalkRequest(t, "it", False, 1) for t in ["x", "y"])
+        self.assertTrue(self.tts.started.wait(5))
+        Audio.talk("y", "it", wait=True)
+        self.assertFalse(self.block.is_set())
+        self.assertEqual(self.played, [str(Audio._get_talkfile("y", "it", False, 1))])
+        self.block.set()
+        self.pool.shutdown(wait=True)
+        self.assertEqual(self.rendered, ["y", "x"])
+        self.assertEqual(Audio._PREFETCHING, {})
+
+    def test_that_cancel_prefetch_drops_queued_talks(self):
+        Audio.prefetch(TalkRequest(t, "it", False, 1) for t in ["x", "y", "z"])
+        self.assertTrue(self.tts.started.wait(5))
+        Audio.cancel_prefetch()
+        self.block.set()
+        self.pool.shutdown(wait=True)
+        self.assertEqual(self.rendered, ["x"])
+        self.assertEqual(Audio._PREFETCHING, {})
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests FileParser class."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import tempfile
+
+from _Review_Vocab import FileParser
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_that_invalid_lines_are_skipped(self):
+        content = "hello;ciao\n\n# comment;x\n// comment;x\nno separator\na;b;c\n  yes;si  \n"
+        result = FileParser.get_valid_lines(content)
+        self.assertEqual(result, ["hello;ciao", "yes;si"])
+
+    def test_that_read_valid_lines_handles_crlf_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vocab.txt")
+            with open(path, "wb") as fo:
+                fo.write("ciao;hello\r\n# x;y\r\nperché;why\r\n".encode("utf-8"))
+            self.assertEqual(FileParser.read_valid_lines(path), ["ciao;hello", "perché;why"])
+
+    def test_that_read_valid_lines_splits_on_all_line_boundaries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vocab.txt")
+            with open(path, "w", encoding="utf-8") as fo:
+                fo.write("ciao;hello\x0cyes;si\u2028no;no\n")
+            self.assertEqual(FileParser.read_valid_lines(path), ["ciao;hello", "yes;si", "no;no"])
+
+    def test_that_read_valid_lines_is_refreshed_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vocab.txt")
+            with open(path, "w") as fo:
+                fo.write("hello;ciao\n")
+            first = FileParser.read_valid_lines(path)
+            self.assertIs(first, FileParser.read_valid_lines(path))
+            with open(path, "w") as fo:
+                fo.write("hello;ciao\nyes;si\n")
+            os.utime(path, (0, os.path.getmtime(path) + 1))
+            self.assertEqual(FileParser.read_valid_lines(path), ["hello;ciao", "yes;si"])
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,6 +30,15 @@ class TestCase(unittest.TestCase):
         result = LangParser.get_equivs("Hello world|everyone.")
         self.assertEqual(result, ["Hello world.", "Hello everyone."])
 
+    def test_that_duplicate_equivs_are_removed(self):
+        result = LangParser.get_equivs("the car/the car|auto")
+        self.assertEqual(result, ["the car", "the auto"])
+
+    def test_that_all_multiple_word_equivs_combinations_are_kept(self):
+        result = LangParser.get_equivs(" ".join(["io|tu"] * 7) + " mangio|bevo")
+        self.assertEqual(len(result), 256)
+        self.assertEqual(result[-1], " ".join(["tu"] * 7) + " bevo")
+
 ##==============================================================#
 ## SECTION: Main Body                                           #
 ##==============================================================#
@@ -0,0 +1,62 @@
+"""Tests provider line selection."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from _Review_Vocab import ChainedLines, ProviderBase
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.parts = [[], ["a", "b"], [], ["c"], ["d", "e", "f"], []]
+        self.flat = ["a", "b", "c", "d", "e", "f"]
+
+    def test_that_chained_lines_matches_concatenated_lines(self):
+        lines = ChainedLines(self.parts)
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(list(lines), self.flat)
+        self.assertEqual([lines[i] for i in range(6)], self.flat)
+
+    def test_that_chained_lines_handles_negative_indices(self):
+        lines = ChainedLines(self.parts)
+        self.assertEqual([lines[i] for i in range(-6, 0)], self.flat)
+        self.assertRaises(IndexError, lambda: lines[6])
+        self.assertRaises(IndexError, lambda: lines[-7])
+
+    def test_that_chained_lines_handles_slices(self):
+        lines = ChainedLines(self.parts)
+        for index in [slice(None), slice(1, 4), slice(-2, None), slice(None, None, 2), slice(None, None, -1), slice(5, 1, -2)]:
+            self.assertEqual(lines[index], self.flat[index])
+
+    def test_that_chained_lines_handles_empty_parts(self):
+        self.assertEqual(len(ChainedLines([])), 0)
+        self.assertEqual(len(ChainedLines([[], []])), 0)
+        self.assertEqual(ChainedLines([[], []])[:], [])
+        self.assertRaises(IndexError, lambda: ChainedLines([[]])[0])
+
+    def test_that_select_lines_keeps_order_without_shuffle(self):
+        lines = ChainedLines(self.parts)
+        self.assertEqual(ProviderBase._select_lines(lines, 4, False), self.flat[:4])
+        self.assertEqual(ProviderBase._select_lines(lines, 10, False), self.flat)
+
+    def test_that_select_lines_samples_unique_lines_with_shuffle(self):
+        lines = ChainedLines(self.parts)
+        selected = ProviderBase._select_lines(lines, 4, True)
+        self.assertEqual(len(selected), 4)
+        self.assertEqual(len(set(selected)), 4)
+        self.assertTrue(set(selected) <= set(self.flat))
+        self.assertEqual(sorted(ProviderBase._select_lines(lines, 10, True)), self.flat)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
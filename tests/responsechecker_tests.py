@@ -22,6 +22,10 @@ class TestCase(unittest.TestCase):
         result = ResponseChecker.is_valid("hello", ["Hello."])
         self.assertTrue(result)
 
+    def test_that_is_valid_ignores_all_punctuation(self):
+        result = ResponseChecker.is_valid("a" * 40, ["a." * 40])
+        self.assertTrue(result)
+
     def test_that_is_valid_ignores_casing(self):
         result = ResponseChecker.is_valid("hello", ["HeLlO"])
         self.assertTrue(result)
@@ -32,6 +36,12 @@ class TestCase(unittest.TestCase):
         self.assertFalse(should_fail)
         self.assertTrue(should_pass)
 
+    def test_that_is_valid_accepts_presanitized_answers(self):
+        answers = ResponseChecker.sanitize_answers(["Helló!", "Ciao."])
+        self.assertEqual(answers, ("hello", "ciao"))
+        result = ResponseChecker.is_valid("CIAO", answers, sanitized=True)
+        self.assertTrue(result)
+
 ##==============================================================#
 ## SECTION: Main Body                                           #
 ##==============================================================#
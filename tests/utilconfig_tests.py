@@ -0,0 +1,54 @@
+"""Tests UtilConfig class."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from _Review_Vocab import LanguageName, ListenModeConfig, UtilConfig
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+CFGDICT = {
+    'providers': {
+        '_common': {'lang2': {'short': "it", 'full': "Italian"}},
+        'multifile': {'filepaths': ["a.txt", "b.txt"]},
+    },
+    'modes': {
+        '_common': {'reviewnum': 12},
+        'listen': {'shuffle': True},
+    },
+}
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_that_nested_config_is_loaded(self):
+        config = UtilConfig.from_dict(CFGDICT)
+        self.assertEqual(config.providers._common.lang2, LanguageName("it", "Italian"))
+        self.assertEqual(config.providers.multifile.filepaths, ["a.txt", "b.txt"])
+
+    def test_that_mode_config_merges_common_values(self):
+        config = UtilConfig.from_dict(CFGDICT)
+        config._cfgdict = CFGDICT
+        mode = config.for_mode("listen")
+        self.assertIsInstance(mode, ListenModeConfig)
+        self.assertEqual(mode.reviewnum, 12)
+        self.assertTrue(mode.shuffle)
+
+    def test_that_wrong_value_type_is_rejected(self):
+        with self.assertRaises(Exception):
+            ListenModeConfig.from_dict({'reviewnum': "many"})
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()